@@ -1,25 +1,29 @@
 import hashlib
-import inspect
 import logging
 import operator
 import os
-import sys
+import random
+import re
+import threading
 import time
 import typing
 from enum import Enum
-from functools import wraps
+from functools import lru_cache, wraps
 
 from peewee import (
     BigIntegerField, 
+    BlobField, 
     BooleanField, 
     CharField, 
     CompositeKey, 
     DateTimeField, 
-    Field, 
     FloatField, 
     IntegerField, 
+    InterfaceError, 
     Metadata, 
     Model, 
+    ModelInsert, 
+    OperationalError, 
     TextField)
 from playhouse.migrate import MySQLMigrator, PostgresqlMigrator, migrate
 from playhouse.pool import PooledMySQLDatabase, PooledPostgresqlDatabase
@@ -30,18 +34,25 @@ from api.db import ParserType, SerializedType
 
 def singleton(cls, *args, **kw):
     instances = {}
+    lock = threading.Lock()
 
     def _singleton():
-        key = str(cls) + str(os.getpid())
-        if key not in instances:
-            instances[key] = cls(*args, **kw)
-        return instances[key]
+        key = (cls, os.getpid())
+        instance = instances.get(key)
+        if instance is None:
+            with lock:
+                instance = instances.get(key)
+                if instance is None:
+                    instance = instances[key] = cls(*args, **kw)
+        return instance
 
     return _singleton
 
 
 CONTINUOUS_FIELD_TYPE = {IntegerField, FloatField, DateTimeField}
 AUTO_DATE_TIMESTAMP_FIELD_PREFIX = {"create", "start", "end", "update", "read_access", "write_access"}
+AUTO_DATE_TIMESTAMP_FIELDS = frozenset(f"{f}_time" for f in AUTO_DATE_TIMESTAMP_FIELD_PREFIX)
+AUTO_DATE_TIMESTAMP_DB_FIELDS = frozenset(f"f_{f}_time" for f in AUTO_DATE_TIMESTAMP_FIELD_PREFIX)
 
 
 class TextFieldType(Enum):
@@ -53,22 +64,62 @@ class LongTextField(TextField):
     field_type = TextFieldType[settings.DATABASE_TYPE.upper()].value
 
 
+class BlobFieldType(Enum):
+    MYSQL = "LONGBLOB"
+    POSTGRES = "BYTEA"
+
+
+class PackedChunkIdsField(BlobField):
+    # space separated 64-bit hex chunk ids, stored as raw 8-byte values behind a marker byte
+    field_type = BlobFieldType[settings.DATABASE_TYPE.upper()].value
+    PACKED_MARKER = b"\x01"
+    # only ids that hex() reproduces exactly are packed, anything else is stored as text
+    PACKABLE_CHUNK_ID = re.compile(r"[0-9a-f]{16}")
+
+    def db_value(self, value):
+        if value is None:
+            return None
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            value = bytes(value)
+            if value[:1] == self.PACKED_MARKER:
+                return super().db_value(value)
+            value = value.decode("utf-8")
+        chunk_ids = value.split() if isinstance(value, str) else list(value)
+        if not chunk_ids:
+            return super().db_value(b"")
+        if all(isinstance(chunk_id, str) and self.PACKABLE_CHUNK_ID.fullmatch(chunk_id) for chunk_id in chunk_ids):
+            return super().db_value(self.PACKED_MARKER + bytes.fromhex("".join(chunk_ids)))
+        return super().db_value(" ".join(chunk_ids).encode("utf-8"))
+
+    def python_value(self, value):
+        if value is None or isinstance(value, str):
+            return value
+        value = bytes(value)
+        if value[:1] == self.PACKED_MARKER:
+            hex_ids = value[1:].hex()
+            return " ".join(hex_ids[i : i + 16] for i in range(0, len(hex_ids), 16))
+        # rows written before the column was packed
+        return value.decode("utf-8")
+
+
 class JSONField(LongTextField):
     default_value = {}
 
     def __init__(self, object_hook=None, object_pairs_hook=None, **kwargs):
         self._object_hook = object_hook
         self._object_pairs_hook = object_pairs_hook
+        self._default_serialized = utils.json_dumps(self.default_value)
         super().__init__(**kwargs)
 
     def db_value(self, value):
         if value is None:
-            value = self.default_value
+            return self._default_serialized
         return utils.json_dumps(value)
 
     def python_value(self, value):
         if not value:
-            return self.default_value
+            # a fresh container, so callers never mutate the shared class default
+            return self.default_value.copy()
         return utils.json_loads(value, object_hook=self._object_hook, object_pairs_hook=self._object_pairs_hook)
 
 
@@ -76,6 +127,21 @@ class ListField(JSONField):
     default_value = []
 
 
+class JSONFieldType(Enum):
+    MYSQL = "JSON"
+    POSTGRES = "JSONB"
+
+
+class NativeJSONField(JSONField):
+    field_type = JSONFieldType[settings.DATABASE_TYPE.upper()].value
+
+    def python_value(self, value):
+        # psycopg2 already decodes jsonb columns, pymysql hands back the raw string
+        if isinstance(value, (dict, list)):
+            return value
+        return super().python_value(value)
+
+
 class SerializedField(LongTextField):
     def __init__(self, serialized_type=SerializedType.PICKLE, object_hook=None, object_pairs_hook=None, **kwargs):
         self._serialized_type = serialized_type
@@ -104,25 +170,34 @@ class SerializedField(LongTextField):
             raise ValueError(f"the serialized type {self._serialized_type} is not supported")
 
 
+@lru_cache(maxsize=None)
 def is_continuous_field(cls: typing.Type) -> bool:
-    if cls in CONTINUOUS_FIELD_TYPE:
-        return True
-    for p in cls.__bases__:
-        if p in CONTINUOUS_FIELD_TYPE:
-            return True
-        elif p is not Field and p is not object:
-            if is_continuous_field(p):
-                return True
-    else:
-        return False
+    return any(base in CONTINUOUS_FIELD_TYPE for base in cls.__mro__)
 
 
 def auto_date_timestamp_field():
-    return {f"{f}_time" for f in AUTO_DATE_TIMESTAMP_FIELD_PREFIX}
+    return AUTO_DATE_TIMESTAMP_FIELDS
 
 
 def auto_date_timestamp_db_field():
-    return {f"f_{f}_time" for f in AUTO_DATE_TIMESTAMP_FIELD_PREFIX}
+    return AUTO_DATE_TIMESTAMP_DB_FIELDS
+
+
+@lru_cache(maxsize=1024)
+def resolve_model_attr(cls, attr):
+    return operator.attrgetter(attr)(cls)
+
+
+@lru_cache(maxsize=1024)
+def query_filter_plan(cls, names):
+    # (name, field, is continuous, is auto date) for each filterable keyword of BaseModel.query
+    plan = []
+    for name in names:
+        field = getattr(cls, name, None)
+        if field is None:
+            continue
+        plan.append((name, field, is_continuous_field(type(field)), name in AUTO_DATE_TIMESTAMP_FIELDS))
+    return tuple(plan)
 
 
 def remove_field_name_prefix(field_name):
@@ -144,13 +219,14 @@ class BaseModel(Model):
 
     def to_human_model_dict(self, only_primary_with: list = None):
         model_dict = self.__dict__["__data__"]
+        display_names = self._field_display_names
 
         if not only_primary_with:
-            return {remove_field_name_prefix(k): v for k, v in model_dict.items()}
+            return {display_names.get(k) or remove_field_name_prefix(k): v for k, v in model_dict.items()}
 
         human_model_dict = {}
         for k in self._meta.primary_key.field_names:
-            human_model_dict[remove_field_name_prefix(k)] = model_dict[k]
+            human_model_dict[display_names[k]] = model_dict[k]
         for k in only_primary_with:
             human_model_dict[k] = model_dict[f"f_{k}"]
         return human_model_dict
@@ -159,41 +235,61 @@ class BaseModel(Model):
     def meta(self) -> Metadata:
         return self._meta
 
+    @classmethod
+    def validate_model(cls):
+        # called by peewee once the model class and its _meta are fully built
+        super().validate_model()
+        combined = cls._meta.combined
+        cls._create_time_field = combined["create_time"]
+        cls._update_time_field = combined["update_time"]
+        cls._auto_date_pairs = tuple(
+            (combined[f"{f_n}_time"], combined[f"{f_n}_date"])
+            for f_n in AUTO_DATE_TIMESTAMP_FIELD_PREFIX
+            if f"{f_n}_time" in combined and f"{f_n}_date" in combined
+        )
+        cls._field_display_names = {name: remove_field_name_prefix(name) for name in cls._meta.fields}
+        primary_key = cls._meta.primary_key
+        if isinstance(primary_key, CompositeKey):
+            cls._primary_key_names = tuple(primary_key.field_names)
+        else:
+            cls._primary_key_names = (primary_key.name,) if primary_key else ()
+
     @classmethod
     def get_primary_keys_name(cls):
-        return cls._meta.primary_key.field_names if isinstance(cls._meta.primary_key, CompositeKey) else [cls._meta.primary_key.name]
+        return list(cls._primary_key_names)
 
     @classmethod
     def getter_by(cls, attr):
-        return operator.attrgetter(attr)(cls)
+        return resolve_model_attr(cls, attr)
 
     @classmethod
-    def query(cls, reverse=None, order_by=None, **kwargs):
+    def query(cls, reverse=None, order_by=None, stream=False, **kwargs):
         filters = []
-        for f_n, f_v in kwargs.items():
-            attr_name = "%s" % f_n
-            if not hasattr(cls, attr_name) or f_v is None:
+        for f_n, field_attr, is_continuous, is_auto_date in query_filter_plan(cls, tuple(kwargs)):
+            f_v = kwargs[f_n]
+            if f_v is None:
                 continue
             if type(f_v) in {list, set}:
                 f_v = list(f_v)
-                if is_continuous_field(type(getattr(cls, attr_name))):
+                if is_continuous:
                     if len(f_v) == 2:
-                        for i, v in enumerate(f_v):
-                            if isinstance(v, str) and f_n in auto_date_timestamp_field():
-                                # time type: %Y-%m-%d %H:%M:%S
-                                f_v[i] = utils.date_string_to_timestamp(v)
+                        if is_auto_date:
+                            for i, v in enumerate(f_v):
+                                if isinstance(v, str):
+                                    # time type: %Y-%m-%d %H:%M:%S
+                                    f_v[i] = utils.date_string_to_timestamp(v)
                         lt_value = f_v[0]
                         gt_value = f_v[1]
                         if lt_value is not None and gt_value is not None:
-                            filters.append(cls.getter_by(attr_name).between(lt_value, gt_value))
+                            filters.append(field_attr.between(lt_value, gt_value))
                         elif lt_value is not None:
-                            filters.append(operator.attrgetter(attr_name)(cls) >= lt_value)
+                            filters.append(field_attr >= lt_value)
                         elif gt_value is not None:
-                            filters.append(operator.attrgetter(attr_name)(cls) <= gt_value)
+                            filters.append(field_attr <= gt_value)
                 else:
-                    filters.append(operator.attrgetter(attr_name)(cls) << f_v)
+                    filters.append(field_attr << f_v)
             else:
-                filters.append(operator.attrgetter(attr_name)(cls) == f_v)
+                filters.append(field_attr == f_v)
         if filters:
             query_records = cls.select().where(*filters)
             if reverse is not None:
@@ -203,31 +299,58 @@ class BaseModel(Model):
                     query_records = query_records.order_by(cls.getter_by(f"{order_by}").desc())
                 elif reverse is False:
                     query_records = query_records.order_by(cls.getter_by(f"{order_by}").asc())
+            if stream:
+                return query_records
             return [query_record for query_record in query_records]
         else:
             return []
 
     @classmethod
     def insert(cls, __data=None, **insert):
+        now = utils.current_timestamp()
         if isinstance(__data, dict) and __data:
-            __data[cls._meta.combined["create_time"]] = utils.current_timestamp()
+            __data[cls._create_time_field] = now
         if insert:
-            insert["create_time"] = utils.current_timestamp()
+            insert["create_time"] = now
 
-        return super().insert(__data, **insert)
+        # same as Model.insert, but update_time reuses the create_time stamp
+        return ModelInsert(cls, cls._normalize_data(__data, insert, now))
+
+    @classmethod
+    def bulk_insert(cls, rows, batch_size=500):
+        with cls._meta.database.atomic():
+            for i in range(0, len(rows), batch_size):
+                batch = rows[i : i + batch_size]
+                now = utils.current_timestamp()
+                now_date = utils.timestamp_to_date(now)
+                for row in batch:
+                    row["create_time"] = row["update_time"] = now
+                    row["create_date"] = row["update_date"] = now_date
+                cls.insert_many(batch).execute()
 
     # update and insert will call this method
     @classmethod
-    def _normalize_data(cls, data, kwargs):
+    def _normalize_data(cls, data, kwargs, now=None):
         normalized = super()._normalize_data(data, kwargs)
         if not normalized:
             return {}
 
-        normalized[cls._meta.combined["update_time"]] = utils.current_timestamp()
+        if now is None:
+            now = utils.current_timestamp()
+        normalized[cls._update_time_field] = now
 
-        for f_n in AUTO_DATE_TIMESTAMP_FIELD_PREFIX:
-            if {f"{f_n}_time", f"{f_n}_date"}.issubset(cls._meta.combined.keys()) and cls._meta.combined[f"{f_n}_time"] in normalized and normalized[cls._meta.combined[f"{f_n}_time"]] is not None:
-                normalized[cls._meta.combined[f"{f_n}_date"]] = utils.timestamp_to_date(normalized[cls._meta.combined[f"{f_n}_time"]])
+        now_date = None
+        for time_field, date_field in cls._auto_date_pairs:
+            timestamp = normalized.get(time_field)
+            if timestamp is None:
+                continue
+            if timestamp == now:
+                # update_time (and usually create_time on insert) share the same stamp
+                if now_date is None:
+                    now_date = utils.timestamp_to_date(now)
+                normalized[date_field] = now_date
+            else:
+                normalized[date_field] = utils.timestamp_to_date(timestamp)
 
         return normalized
 
@@ -256,12 +379,17 @@ class BaseDataBase:
         logging.info("init database on cluster mode successfully")
 
 
-def with_retry(max_retries=3, retry_delay=1.0):
+class DatabaseLockTimeout(Exception):
+    pass
+
+
+def with_retry(max_retries=3, retry_delay=1.0, exceptions=(OperationalError, InterfaceError)):
     """Decorator: Add retry mechanism to database operations
 
     Args:
         max_retries (int): maximum number of retries
-        retry_delay (float): initial retry delay (seconds), will increase exponentially
+        retry_delay (float): initial retry delay (seconds), will increase exponentially with jitter
+        exceptions (tuple): exception types worth retrying, anything else is raised immediately
 
     Returns:
         decorated function
@@ -274,7 +402,7 @@ def with_retry(max_retries=3, retry_delay=1.0):
             for retry in range(max_retries):
                 try:
                     return func(*args, **kwargs)
-                except Exception as e:
+                except exceptions as e:
                     last_exception = e
                     # get self and method name for logging
                     self_obj = args[0] if args else None
@@ -282,7 +410,7 @@ def with_retry(max_retries=3, retry_delay=1.0):
                     lock_name = getattr(self_obj, "lock_name", "unknown") if self_obj else "unknown"
 
                     if retry < max_retries - 1:
-                        current_delay = retry_delay * (2**retry)
+                        current_delay = random.uniform(retry_delay, retry_delay * (2**retry))
                         logging.warning(f"{func_name} {lock_name} failed: {str(e)}, retrying ({retry + 1}/{max_retries})")
                         time.sleep(current_delay)
                     else:
@@ -297,19 +425,25 @@ def with_retry(max_retries=3, retry_delay=1.0):
     return decorator
 
 
+@lru_cache(maxsize=4096)
+def postgres_lock_id(lock_name):
+    # same value as int(md5.hexdigest(), 16), without the hex round-trip
+    return int.from_bytes(hashlib.md5(lock_name.encode()).digest(), "big") % (2**31 - 1)
+
+
 class PostgresDatabaseLock:
     def __init__(self, lock_name, timeout=10, db=None):
         self.lock_name = lock_name
-        self.lock_id = int(hashlib.md5(lock_name.encode()).hexdigest(), 16) % (2**31 - 1)
+        self.lock_id = postgres_lock_id(lock_name)
         self.timeout = int(timeout)
         self.db = db if db else DB
 
-    @with_retry(max_retries=3, retry_delay=1.0)
+    @with_retry(max_retries=3, retry_delay=1.0, exceptions=(OperationalError, InterfaceError, DatabaseLockTimeout))
     def lock(self):
         cursor = self.db.execute_sql("SELECT pg_try_advisory_lock(%s)", (self.lock_id,))
         ret = cursor.fetchone()
         if ret[0] == 0:
-            raise Exception(f"acquire postgres lock {self.lock_name} timeout")
+            raise DatabaseLockTimeout(f"acquire postgres lock {self.lock_name} timeout")
         elif ret[0] == 1:
             return True
         else:
@@ -350,13 +484,13 @@ class MysqlDatabaseLock:
         self.timeout = int(timeout)
         self.db = db if db else DB
 
-    @with_retry(max_retries=3, retry_delay=1.0)
+    @with_retry(max_retries=3, retry_delay=1.0, exceptions=(OperationalError, InterfaceError, DatabaseLockTimeout))
     def lock(self):
         # SQL parameters only support %s format placeholders
         cursor = self.db.execute_sql("SELECT GET_LOCK(%s, %s)", (self.lock_name, self.timeout))
         ret = cursor.fetchone()
         if ret[0] == 0:
-            raise Exception(f"acquire mysql lock {self.lock_name} timeout")
+            raise DatabaseLockTimeout(f"acquire mysql lock {self.lock_name} timeout")
         elif ret[0] == 1:
             return True
         else:
@@ -408,30 +542,33 @@ def close_connection():
         logging.exception(e)
 
 
+TABLES: typing.List[typing.Type["DataBaseModel"]] = []
+
+
 class DataBaseModel(BaseModel):
     class Meta:
         database = DB
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        TABLES.append(cls)
+
 
 @DB.connection_context()
 def init_database_tables(alter_fields=[]):
-    members = inspect.getmembers(sys.modules[__name__], inspect.isclass)
-    table_objs = []
     create_failed_list = []
-    for name, obj in members:
-        if obj != DataBaseModel and issubclass(obj, DataBaseModel):
-            table_objs.append(obj)
-
-            if not obj.table_exists():
-                logging.debug(f"start create table {obj.__name__}")
-                try:
-                    obj.create_table()
-                    logging.debug(f"create table success: {obj.__name__}")
-                except Exception as e:
-                    logging.exception(e)
-                    create_failed_list.append(obj.__name__)
-            else:
-                logging.debug(f"table {obj.__name__} already exists, skip creation.")
+    existing_tables = set(DB.get_tables())
+    for obj in TABLES:
+        if obj._meta.table_name not in existing_tables:
+            logging.debug(f"start create table {obj.__name__}")
+            try:
+                obj.create_table()
+                logging.debug(f"create table success: {obj.__name__}")
+            except Exception as e:
+                logging.exception(e)
+                create_failed_list.append(obj.__name__)
+        else:
+            logging.debug(f"table {obj.__name__} already exists, skip creation.")
 
     if create_failed_list:
         logging.error(f"create tables failed: {create_failed_list}")
@@ -540,7 +677,7 @@ class Knowledgebase(DataBaseModel):
     chunk_num = IntegerField(default=0, index=True)
 
     parser_id = CharField(max_length=32, null=False, help_text="default parser ID", default=ParserType.NAIVE.value, index=True)
-    parser_config = JSONField(null=False, default={"pages": [[1, 1000000]]})
+    parser_config = NativeJSONField(null=False, default={"pages": [[1, 1000000]]})
     status = CharField(max_length=1, null=True, help_text="is it validate(0: wasted, 1: validate)", default="1", index=True)
 
     created_by = CharField(max_length=32, null=False, index=True)
@@ -556,7 +693,7 @@ class Document(DataBaseModel):
     id = CharField(max_length=32, primary_key=True)
     kb_id = CharField(max_length=256, null=False, index=True)
     parser_id = CharField(max_length=32, null=False, help_text="default parser ID", index=True)
-    parser_config = JSONField(null=False, default={"pages": [[1, 1000000]]})
+    parser_config = NativeJSONField(null=False, default={"pages": [[1, 1000000]]})
     source_type = CharField(max_length=128, null=False, default="local", help_text="where dose this document come from", index=True)
     type = CharField(max_length=32, null=False, help_text="file extension", index=True)
     created_by = CharField(max_length=32, null=False, help_text="who created it", index=True)
@@ -568,7 +705,7 @@ class Document(DataBaseModel):
     progress_msg = TextField(null=True, help_text="process message", default="")
     process_begin_at = DateTimeField(null=True, index=True)
     process_duration = FloatField(default=0)
-    meta_fields = JSONField(null=True, default={})
+    meta_fields = NativeJSONField(null=True, default={})
 
     run = CharField(max_length=1, null=True, help_text="start to run processing or cancel.(1: run it; 2: cancel)", default="0", index=True)
     status = CharField(max_length=1, null=True, help_text="is it validate(0: wasted, 1: validate)", default="1", index=True)
@@ -616,7 +753,7 @@ class Task(DataBaseModel):
     progress_msg = TextField(null=True, help_text="process message", default="")
     retry_count = IntegerField(default=0)
     digest = TextField(null=True, help_text="task digest", default="")
-    chunk_ids = LongTextField(null=True, help_text="chunk ids", default="")
+    chunk_ids = PackedChunkIdsField(null=True, help_text="chunk ids", default="")
 
 
 class Search(DataBaseModel):
@@ -626,7 +763,7 @@ class Search(DataBaseModel):
     name = CharField(max_length=128, null=False, help_text="Search name", index=True)
     description = TextField(null=True, help_text="KB description")
     created_by = CharField(max_length=32, null=False, index=True)
-    search_config = JSONField(
+    search_config = NativeJSONField(
         null=False,
         default={
             "kb_ids": [],
@@ -665,60 +802,66 @@ class Search(DataBaseModel):
 
 def migrate_db():
     migrator = DatabaseMigrator[settings.DATABASE_TYPE.upper()].value(DB)
-    try:
-        migrate(migrator.add_column("file", "source_type", CharField(max_length=128, null=False, default="", help_text="where dose this document come from", index=True)))
-    except Exception:
-        pass
-    try:
-        migrate(migrator.add_column("tenant", "rerank_id", CharField(max_length=128, null=False, default="BAAI/bge-reranker-v2-m3", help_text="default rerank model ID")))
-    except Exception:
-        pass
-    try:
-        migrate(migrator.alter_column_type("tenant_llm", "api_key", CharField(max_length=2048, null=True, help_text="API KEY", index=True)))
-    except Exception:
-        pass
-    try:
-        migrate(migrator.add_column("tenant", "tts_id", CharField(max_length=256, null=True, help_text="default tts model ID", index=True)))
-    except Exception:
-        pass
-    try:
-        migrate(migrator.add_column("task", "retry_count", IntegerField(default=0)))
-    except Exception:
-        pass
-    try:
-        migrate(migrator.add_column("tenant_llm", "max_tokens", IntegerField(default=8192, index=True)))
-    except Exception:
-        pass
-    try:
-        migrate(migrator.add_column("task", "digest", TextField(null=True, help_text="task digest", default="")))
-    except Exception:
-        pass
+    table_columns = {}
+
+    def existing_columns(table):
+        if table not in table_columns:
+            table_columns[table] = {column.name: column.data_type for column in DB.get_columns(table)}
+        return table_columns[table]
+
+    operations = []
+    for table, column, field in (
+        ("file", "source_type", CharField(max_length=128, null=False, default="", help_text="where dose this document come from", index=True)),
+        ("tenant", "rerank_id", CharField(max_length=128, null=False, default="BAAI/bge-reranker-v2-m3", help_text="default rerank model ID")),
+        ("tenant", "tts_id", CharField(max_length=256, null=True, help_text="default tts model ID", index=True)),
+        ("task", "retry_count", IntegerField(default=0)),
+        ("tenant_llm", "max_tokens", IntegerField(default=8192, index=True)),
+        ("task", "digest", TextField(null=True, help_text="task digest", default="")),
+        ("task", "chunk_ids", PackedChunkIdsField(null=True, help_text="chunk ids", default="")),
+        ("document", "meta_fields", NativeJSONField(null=True, default={})),
+        ("task", "task_type", CharField(max_length=32, null=False, default="")),
+        ("task", "priority", IntegerField(default=0)),
+        ("llm", "is_tools", BooleanField(null=False, help_text="support tools", default=False)),
+    ):
+        if column not in existing_columns(table):
+            operations.append(migrator.add_column(table, column, field))
+
+    # column metadata does not expose the varchar length, so this one is always applied
+    operations.append(migrator.alter_column_type("tenant_llm", "api_key", CharField(max_length=2048, null=True, help_text="API KEY", index=True)))
+
+    is_postgres = settings.DATABASE_TYPE.upper() == "POSTGRES"
+    for table, column, field in (
+        ("knowledgebase", "parser_config", NativeJSONField(null=False)),
+        ("document", "parser_config", NativeJSONField(null=False)),
+        ("document", "meta_fields", NativeJSONField(null=True)),
+        ("search", "search_config", NativeJSONField(null=False)),
+    ):
+        data_type = existing_columns(table).get(column)
+        if data_type and data_type.lower() not in ("json", "jsonb"):
+            cast = f"{column}::jsonb" if is_postgres else None
+            operations.append(migrator.alter_column_type(table, column, field, cast=cast))
+
+    data_type = existing_columns("task").get("chunk_ids")
+    if data_type and data_type.lower() not in ("longblob", "bytea"):
+        # existing text is kept as utf-8 bytes and still readable by PackedChunkIdsField
+        cast = "convert_to(chunk_ids, 'UTF8')" if is_postgres else None
+        operations.append(migrator.alter_column_type("task", "chunk_ids", PackedChunkIdsField(null=True), cast=cast))
+
+    for table, old_name, new_name in (
+        ("task", "process_duation", "process_duration"),
+        ("document", "process_duation", "process_duration"),
+    ):
+        columns = existing_columns(table)
+        if old_name in columns and new_name not in columns:
+            operations.append(migrator.rename_column(table, old_name, new_name))
 
     try:
-        migrate(migrator.add_column("task", "chunk_ids", LongTextField(null=True, help_text="chunk ids", default="")))
-    except Exception:
-        pass
-    try:
-        migrate(migrator.add_column("document", "meta_fields", JSONField(null=True, default={})))
-    except Exception:
-        pass
-    try:
-        migrate(migrator.add_column("task", "task_type", CharField(max_length=32, null=False, default="")))
-    except Exception:
-        pass
-    try:
-        migrate(migrator.add_column("task", "priority", IntegerField(default=0)))
-    except Exception:
-        pass
-    try:
-        migrate(migrator.add_column("llm", "is_tools", BooleanField(null=False, help_text="support tools", default=False)))
-    except Exception:
-        pass
-    try:
-        migrate(migrator.rename_column("task", "process_duation", "process_duration"))
-    except Exception:
-        pass
-    try:
-        migrate(migrator.rename_column("document", "process_duation", "process_duration"))
+        with DB.atomic():
+            migrate(*operations)
     except Exception:
-        pass
+        # apply one by one so that a single failing operation does not block the others
+        for operation in operations:
+            try:
+                migrate(operation)
+            except Exception as e:
+                logging.warning(f"database migration operation skipped: {str(e)}")
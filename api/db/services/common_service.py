@@ -155,18 +155,13 @@ class CommonService:
         """Insert multiple records in batches.
 
         This method efficiently inserts multiple records into the database using batch processing.
-        It automatically sets creation timestamps for all records.
+        It automatically sets creation and update timestamps for all records, once per batch.
 
         Args:
             data_list (list): List of dictionaries containing record data to insert.
             batch_size (int, optional): Number of records to insert in each batch. Defaults to 100.
         """
-        with DB.atomic():
-            for d in data_list:
-                d["create_time"] = current_timestamp()
-                d["create_date"] = datetime_format(datetime.now())
-            for i in range(0, len(data_list), batch_size):
-                cls.model.insert_many(data_list[i : i + batch_size]).execute()
+        cls.model.bulk_insert(data_list, batch_size=batch_size)
 
     @classmethod
     @DB.connection_context()
@@ -1,3 +1,4 @@
+import json
 import logging
 import os
 import random
@@ -371,7 +372,11 @@ def queue_tasks(doc: dict, bucket: str, name: str, priority: int):
                 for k in ["raptor", "graphrag"]:
                     if k in chunking_config[field]:
                         del chunking_config[field][k]
-            hasher.update(str(chunking_config[field]).encode("utf-8"))
+            value = chunking_config[field]
+            if isinstance(value, dict):
+                # JSON columns do not keep the key order the config was written with
+                value = json.dumps(value, sort_keys=True, default=str)
+            hasher.update(str(value).encode("utf-8"))
         for field in ["doc_id", "from_page", "to_page"]:
             hasher.update(str(task.get(field, "")).encode("utf-8"))
         task_digest = hasher.hexdigest()
@@ -2,8 +2,10 @@ import base64
 import datetime
 import io
 import json
+import math
 import os
 import pickle
+import re
 import socket
 import time
 import uuid
@@ -14,6 +16,11 @@ from enum import Enum, IntEnum
 import importlib
 from api.constants import SERVICE_CONF
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from . import file_utils
 
 
@@ -143,7 +150,41 @@ def bytes_to_string(byte):
     return byte.decode(encoding="utf-8")
 
 
+_ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+_ORJSON_DEFAULTS = {
+    False: CustomJSONEncoder(with_type=False).default,
+    True: CustomJSONEncoder(with_type=True).default,
+}
+# orjson reads integer literals outside the int64/uint64 range back as floats
+_WIDE_INT_PATTERNS = {bytes: re.compile(rb"\d{19}"), str: re.compile(r"\d{19}")}
+
+
+def _may_hold_non_finite(obj):
+    # orjson writes NaN/Infinity as null without raising, only called when the output holds a null
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        # OPT_NON_STR_KEYS writes a non-finite float key as "null" too
+        return any(
+            (isinstance(k, float) and not math.isfinite(k)) or _may_hold_non_finite(v)
+            for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple)):
+        return any(_may_hold_non_finite(v) for v in obj)
+    # anything serialized through CustomJSONEncoder.default may expand to floats we cannot see
+    return not (obj is None or isinstance(obj, (str, int, datetime.date)))
+
+
 def json_dumps(src, byte=False, indent=None, with_type=False):
+    if orjson is not None and indent is None:
+        # datetimes are passed through to CustomJSONEncoder to keep the stored format
+        try:
+            dest = orjson.dumps(src, default=_ORJSON_DEFAULTS[with_type], option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits, let the stdlib encoder handle or report it
+            dest = None
+        if dest is not None and not (b"null" in dest and _may_hold_non_finite(src)):
+            return dest if byte else bytes_to_string(dest)
     dest = json.dumps(
         src,
         indent=indent,
@@ -155,6 +196,16 @@ def json_dumps(src, byte=False, indent=None, with_type=False):
 
 
 def json_loads(src, object_hook=None, object_pairs_hook=None):
+    # orjson has no hook support, only take the fast path for plain documents
+    # that cannot hold integers wider than 64 bits
+    wide_int_pattern = _WIDE_INT_PATTERNS.get(type(src))
+    if (orjson is not None and object_hook is None and object_pairs_hook is None
+            and wide_int_pattern is not None and not wide_int_pattern.search(src)):
+        try:
+            return orjson.loads(src)
+        except orjson.JSONDecodeError:
+            # e.g. NaN/Infinity literals, which only the stdlib parser accepts
+            pass
     if isinstance(src, bytes):
         src = bytes_to_string(src)
     return json.loads(src, object_hook=object_hook,
@@ -174,14 +225,24 @@ def timestamp_to_date(timestamp, format_string="%Y-%m-%d %H:%M:%S"):
     return str_date
 
 
+_DATE_TIME_PATTERN = re.compile(r"(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2})")
+
+
 def date_string_to_timestamp(time_str, format_string="%Y-%m-%d %H:%M:%S"):
+    if format_string == "%Y-%m-%d %H:%M:%S":
+        match = _DATE_TIME_PATTERN.fullmatch(time_str)
+        # leap seconds (60, 61) are accepted by strptime but rejected by datetime()
+        if match and int(match.group(6)) <= 59:
+            # datetime() validates the fields like strptime does, at a fraction of the cost
+            date_time = datetime.datetime(*map(int, match.groups()))
+            return int(time.mktime(date_time.timetuple()) * 1000)
     time_array = time.strptime(time_str, format_string)
     time_stamp = int(time.mktime(time_array) * 1000)
     return time_stamp
 
 
 def serialize_b64(src, to_str=False):
-    dest = base64.b64encode(pickle.dumps(src))
+    dest = base64.b64encode(pickle.dumps(src, protocol=pickle.HIGHEST_PROTOCOL))
     if not to_str:
         return dest
     else:
@@ -1,10 +1,18 @@
+import atexit
 import os
 import os.path
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+import time
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 initialized_root_logger = False
+_init_lock = threading.Lock()
+_LOG = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
 def get_project_base_directory():
     PROJECT_BASE = os.path.abspath(
         os.path.join(
@@ -15,62 +23,124 @@ def get_project_base_directory():
     )
     return PROJECT_BASE
 
+class CachedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that re-checks the log path type at most every check_interval seconds.
+
+    The stock shouldRollover stats the path twice per record, which is slow on network filesystems.
+    """
+
+    check_interval = 1.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_check = float("-inf")
+        self._is_regular_file = True
+
+    def _open(self):
+        # create the log directory only when it is actually missing
+        try:
+            return super()._open()
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+            return super()._open()
+
+    def shouldRollover(self, record):
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            self._last_check = now
+            # never rollover anything other than regular files, as in the stock handler
+            self._is_regular_file = not os.path.exists(self.baseFilename) or os.path.isfile(self.baseFilename)
+        if not self._is_regular_file:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes > 0:
+            msg = "%s\n" % self.format(record)
+            self.stream.seek(0, 2)
+            if self.stream.tell() + len(msg) >= self.maxBytes:
+                return True
+        return False
+
+
+class _FastStderrHandler(logging.Handler):
+    """Writes records to file descriptor 2 as utf-8 bytes, bypassing the sys.stderr text wrapper."""
+
+    def emit(self, record):
+        try:
+            data = memoryview((self.format(record) + "\n").encode("utf-8", "replace"))
+            while data:
+                data = data[os.write(2, data):]
+        except Exception:
+            self.handleError(record)
+
+
 def init_root_logger(logfile_basename: str, log_format: str = "%(asctime)-15s %(levelname)-8s %(process)d %(message)s"):
     global initialized_root_logger
     if initialized_root_logger:
         return
-    initialized_root_logger = True
+    with _init_lock:
+        if initialized_root_logger:
+            return
+        _init_root_logger(logfile_basename, log_format)
+        initialized_root_logger = True
+
 
+def _init_root_logger(logfile_basename: str, log_format: str):
     logger = logging.getLogger()
     logger.handlers.clear()
     log_path = os.path.abspath(os.path.join(get_project_base_directory(), "logs", f"{logfile_basename}.log"))
 
-    os.makedirs(os.path.dirname(log_path), exist_ok=True)
-    formatter = logging.Formatter(log_format)
+    # the pid never changes for this process, so bake it into the format once
+    formatter = logging.Formatter(log_format.replace("%(process)d", str(os.getpid())))
 
-    handler1 = RotatingFileHandler(log_path, maxBytes=10*1024*1024, backupCount=5)
+    handler1 = CachedRotatingFileHandler(log_path, maxBytes=10*1024*1024, backupCount=5, delay=True)
     handler1.setFormatter(formatter)
-    logger.addHandler(handler1)
 
-    handler2 = logging.StreamHandler()
+    handler2 = _FastStderrHandler()
     handler2.setFormatter(formatter)
-    logger.addHandler(handler2)
+
+    # callers only enqueue records, formatting and file/stream I/O run on the listener thread
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, handler1, handler2, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
 
     logging.captureWarnings(True)
 
     LOG_LEVELS = os.environ.get("LOG_LEVELS", "")
     pkg_levels = {}
     for pkg_name_level in LOG_LEVELS.split(","):
-        terms = pkg_name_level.split("=")
-        if len(terms)!= 2:
+        pkg_name, sep, pkg_level = pkg_name_level.partition("=")
+        if not sep:
             continue
-        pkg_name, pkg_level = terms[0], terms[1]
-        pkg_name = pkg_name.strip()
         pkg_level = logging.getLevelName(pkg_level.strip().upper())
         if not isinstance(pkg_level, int):
             pkg_level = logging.INFO
-        pkg_levels[pkg_name] = logging.getLevelName(pkg_level)
+        pkg_levels[pkg_name.strip()] = pkg_level
 
     for pkg_name in ['peewee', 'pdfminer']:
         if pkg_name not in pkg_levels:
-            pkg_levels[pkg_name] = logging.getLevelName(logging.WARNING)
+            pkg_levels[pkg_name] = logging.WARNING
     if 'root' not in pkg_levels:
-        pkg_levels['root'] = logging.getLevelName(logging.INFO)
+        pkg_levels['root'] = logging.INFO
 
     for pkg_name, pkg_level in pkg_levels.items():
         pkg_logger = logging.getLogger(pkg_name)
         pkg_logger.setLevel(pkg_level)
 
-    msg = f"{logfile_basename} log path: {log_path}, log levels: {pkg_levels}"
-    logger.info(msg)
+    if logger.isEnabledFor(logging.INFO):
+        level_names = {k: logging.getLevelName(v) for k, v in pkg_levels.items()}
+        logger.info("%s log path: %s, log levels: %s", logfile_basename, log_path, level_names)
 
 
 def log_exception(e, *args):
-    logging.exception(e)
+    _LOG.exception(e)
     for a in args:
-        if hasattr(a, "text"):
-            logging.error(a.text)
-            raise Exception(a.text)
+        text = getattr(a, "text", None)
+        if text is not None:
+            _LOG.error("%s", text)
+            raise Exception(text)
         else:
-            logging.error(str(a))
+            _LOG.error("%s", a)
     raise e
\ No newline at end of file
@@ -1,48 +1,91 @@
+import functools
 import importlib
-import inspect
-
-ChatModel = globals().get("ChatModel", {})
-CvModel = globals().get("CvModel", {})
-EmbeddingModel = globals().get("EmbeddingModel", {})
-RerankModel = globals().get("RerankModel", {})
-Seq2txtModel = globals().get("Seq2txtModel", {})
-TTSModel = globals().get("TTSModel", {})
-
-MODULE_MAPPING = {
-    "chat_model": ChatModel,
-    "cv_model": CvModel,
-    "embedding_model": EmbeddingModel,
-    "rerank_model": RerankModel,
-    "sequence2txt_model": Seq2txtModel,
-    "tts_model": TTSModel,
+import itertools
+from collections.abc import Mapping
+
+# model kind -> (exported mapping name, submodule providing its model classes)
+_MODEL_KINDS = {
+    "chat": ("ChatModel", "chat_model"),
+    "cv": ("CvModel", "cv_model"),
+    "embedding": ("EmbeddingModel", "embedding_model"),
+    "rerank": ("RerankModel", "rerank_model"),
+    "seq2txt": ("Seq2txtModel", "sequence2txt_model"),
+    "tts": ("TTSModel", "tts_model"),
 }
+_EXPORTED_KINDS = {export_name: kind for kind, (export_name, _) in _MODEL_KINDS.items()}
+
+# model kind -> {factory name: model class}, filled on first access
+_REGISTRY = {kind: {} for kind in _MODEL_KINDS}
+
+MODULE_MAPPING = {module_name: _REGISTRY[kind] for kind, (_, module_name) in _MODEL_KINDS.items()}
 
 package_name = __name__
 
-for module_name, mapping_dict in MODULE_MAPPING.items():
-    full_module_name = f"{package_name}.{module_name}"
+
+def _iter_subclasses(base_class):
+    for subclass in base_class.__subclasses__():
+        yield subclass
+        yield from _iter_subclasses(subclass)
+
+
+@functools.lru_cache(maxsize=None)
+def get_model_registry(kind):
+    mapping_dict = _REGISTRY[kind]
+    full_module_name = f"{package_name}.{_MODEL_KINDS[kind][1]}"
     module = importlib.import_module(full_module_name)
 
-    base_class = None
-    for name, obj in inspect.getmembers(module):
-        if inspect.isclass(obj) and name == "Base":
-            base_class = obj
-            break
+    base_class = getattr(module, "Base", None)
     if base_class is None:
-        continue
-
-    for _, obj in inspect.getmembers(module):
-        if (
-            inspect.isclass(obj)
-            and issubclass(obj, base_class)
-            and obj is not base_class
-            and hasattr(obj, "_FACTORY_NAME")
-        ):
-            if isinstance(obj._FACTORY_NAME, list):
-                for factory_name in obj._FACTORY_NAME:
-                    mapping_dict[factory_name] = obj
-            else:
-                mapping_dict[obj._FACTORY_NAME] = obj
+        return mapping_dict
+
+    for obj in _iter_subclasses(base_class):
+        if obj.__module__ != full_module_name:
+            continue
+        factory = getattr(obj, "_FACTORY_NAME", None)
+        if factory is None:
+            continue
+        if isinstance(factory, (list, tuple)):
+            mapping_dict.update(zip(factory, itertools.repeat(obj)))
+        else:
+            mapping_dict[factory] = obj
+    return mapping_dict
+
+
+class _LazyModelMapping(Mapping):
+    """Read-only {factory name: model class} view that imports its submodule on first lookup."""
+
+    def __init__(self, kind):
+        self._kind = kind
+
+    def __getitem__(self, factory_name):
+        return get_model_registry(self._kind)[factory_name]
+
+    def __contains__(self, factory_name):
+        return factory_name in get_model_registry(self._kind)
+
+    def __iter__(self):
+        return iter(get_model_registry(self._kind))
+
+    def __len__(self):
+        return len(get_model_registry(self._kind))
+
+    def __repr__(self):
+        return f"<{_MODEL_KINDS[self._kind][0]} registry>"
+
+
+def __getattr__(name):
+    # PEP 562: importing a mapping is free, the heavy model SDKs are only
+    # imported once a factory is actually looked up in it
+    kind = _EXPORTED_KINDS.get(name)
+    if kind is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    mapping = globals()[name] = _LazyModelMapping(kind)
+    return mapping
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     "ChatModel",
@@ -0,0 +1,17 @@
+import time
+
+import pytest
+
+from api.utils import date_string_to_timestamp
+
+
+@pytest.mark.parametrize("time_str", ["2024-02-29 12:00:00", "2024-01-01 23:59:60", "2024-01-01 23:59:61"])
+def test_date_string_to_timestamp_matches_strptime(time_str):
+    expected = int(time.mktime(time.strptime(time_str, "%Y-%m-%d %H:%M:%S")) * 1000)
+    assert date_string_to_timestamp(time_str) == expected
+
+
+@pytest.mark.parametrize("time_str", ["2023-02-29 12:00:00", "2024-01-01 24:00:00", "2024-01-01 23:59:62"])
+def test_date_string_to_timestamp_rejects_invalid(time_str):
+    with pytest.raises(ValueError):
+        date_string_to_timestamp(time_str)
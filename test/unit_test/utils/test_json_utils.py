@@ -0,0 +1,33 @@
+import json
+import math
+
+import pytest
+
+from api.utils import json_dumps, json_loads
+
+
+@pytest.mark.parametrize("value", [2**70, -(2**70), 2**64, -(2**63) - 1, 10**19 - 1, 2**64 - 1, -(2**63)])
+def test_wide_integer_round_trip(value):
+    src = {"x": value, "y": [value]}
+    assert json_loads(json_dumps(src)) == src
+    assert json_loads(json_dumps(src, byte=True)) == src
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+def test_non_finite_float_round_trip(value):
+    dest = json_dumps({"x": value, "y": None})
+    assert "null" in dest
+    assert json_loads(dest)["y"] is None
+    loaded = json_loads(dest)["x"]
+    assert isinstance(loaded, float)
+    assert loaded == value or (math.isnan(value) and math.isnan(loaded))
+
+
+def test_plain_document_round_trip():
+    src = {"a": 1, "b": [1.5, "c", None, True], "d": {"e": 18446744073709551615}}
+    assert json_loads(json_dumps(src)) == src
+
+
+@pytest.mark.parametrize("key", [float("nan"), float("inf"), float("-inf")])
+def test_non_finite_float_key(key):
+    assert json_dumps({key: 1}) == json.dumps({key: 1})